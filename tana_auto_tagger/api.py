@@ -1,15 +1,19 @@
 """FastAPI webhook endpoint for Tana Auto-Tagger."""
 
-import json
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
+import orjson
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
 from pydantic import BaseModel
 
+from .cache import count_json, read_json, write_raw_json_list
 from .config import config
-from .models import Note, Tag, TagSuggestion
+from .models import HIGH_CONFIDENCE, MEDIUM_CONFIDENCE, Note, Tag, TagSuggestion
 from .classifier import get_classifier
 from .tana_client import TanaDataProvider
 from .session_manager import session_manager
@@ -31,6 +35,12 @@ CACHE_DIR = Path(__file__).parent.parent / ".cache"
 TAGS_CACHE = CACHE_DIR / "tags.json"
 NOTES_CACHE = CACHE_DIR / "notes.json"
 
+# Single worker: the model is not thread-safe and already uses intra-op threads
+CLASSIFIER_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="classifier")
+
+# Shared data provider (stateless, safe to reuse across calls)
+_PROVIDER = TanaDataProvider()
+
 
 class ProcessRequest(BaseModel):
     """Request body for process endpoint."""
@@ -80,12 +90,10 @@ def load_tags() -> list[Tag]:
     if not TAGS_CACHE.exists():
         raise HTTPException(status_code=404, detail="Tags cache not found. Refresh cache first.")
     
-    with open(TAGS_CACHE, "r", encoding="utf-8") as f:
-        raw_tags = json.load(f)
+    raw_tags = read_json(TAGS_CACHE)
     
-    provider = TanaDataProvider()
-    tags = provider.parse_tags_response(raw_tags)
-    return provider.filter_excluded_tags(tags)
+    tags = _PROVIDER.parse_tags_response(raw_tags)
+    return _PROVIDER.filter_excluded_tags(tags)
 
 
 def load_notes() -> list[Note]:
@@ -93,10 +101,32 @@ def load_notes() -> list[Note]:
     if not NOTES_CACHE.exists():
         raise HTTPException(status_code=404, detail="Notes cache not found. Refresh cache first.")
     
-    with open(NOTES_CACHE, "r", encoding="utf-8") as f:
-        raw_notes = json.load(f)
+    raw_notes = read_json(NOTES_CACHE)
+    
+    return _PROVIDER.parse_notes_response(raw_notes)
+
+
+@app.on_event("startup")
+async def preload_classifier():
+    """
+    Load the model and tag embeddings before the first request.
     
-    return TanaDataProvider.parse_notes_response(raw_notes)
+    Best effort: a failure (offline model download, malformed tags cache) is
+    logged and the API still starts, so /cache/tags can replace a bad cache
+    and /process loads the classifier lazily.
+    """
+    try:
+        await asyncio.get_running_loop().run_in_executor(CLASSIFIER_POOL, _warmup_classifier)
+    except Exception:
+        logger.exception("Classifier warmup failed; it will load on first use")
+
+
+def _warmup_classifier() -> None:
+    """Load the model, run one inference and embed cached tags."""
+    classifier = get_classifier()
+    classifier.model.encode(["warmup"], convert_to_numpy=True)
+    if TAGS_CACHE.exists():
+        classifier.load_tags(load_tags())
 
 
 @app.get("/")
@@ -124,17 +154,14 @@ async def status():
     }
     
     if TAGS_CACHE.exists():
-        with open(TAGS_CACHE) as f:
-            result["cache"]["tags"] = len(json.load(f))
+        result["cache"]["tags"] = count_json(TAGS_CACHE)
     
     if NOTES_CACHE.exists():
-        with open(NOTES_CACHE) as f:
-            result["cache"]["notes"] = len(json.load(f))
+        result["cache"]["notes"] = count_json(NOTES_CACHE)
     
     pending = CACHE_DIR / "pending_assignments.json"
     if pending.exists():
-        with open(pending) as f:
-            result["cache"]["pending"] = len(json.load(f))
+        result["cache"]["pending"] = count_json(pending)
     
     return result
 
@@ -158,20 +185,52 @@ async def process_notes(request: ProcessRequest):
             results=[]
         )
     
-    # Initialize classifier
+    # Classify off the event loop so other endpoints stay responsive
+    return await asyncio.get_running_loop().run_in_executor(
+        CLASSIFIER_POOL, _process_sync, request, tags, notes
+    )
+
+
+def _classify_notes(
+    tags: list[Tag],
+    notes: list[Note],
+    top_k: int,
+    min_score: float
+) -> list[list[TagSuggestion]]:
+    """Load tags into the shared classifier and classify notes in one batch."""
     classifier = get_classifier()
     classifier.load_tags(tags)
+    return classifier.classify_batch(notes, top_k=top_k, min_score=min_score)
+
+
+def _confidence_labels(scores: np.ndarray) -> np.ndarray:
+    """Vectorized equivalent of TagSuggestion.confidence_label."""
+    return np.select(
+        [scores >= HIGH_CONFIDENCE, scores >= MEDIUM_CONFIDENCE],
+        ["High", "Medium"],
+        default="Low"
+    )
+
+
+def _process_sync(
+    request: ProcessRequest,
+    tags: list[Tag],
+    notes: list[Note]
+) -> ProcessResponse:
+    """Run classification and build the /process response (CPU-bound)."""
+    batch = _classify_notes(tags, notes, request.top_k, request.min_score)
+    
+    # Label every suggestion score in one vectorized pass
+    scores = np.fromiter(
+        (s.score for suggestions in batch for s in suggestions),
+        dtype=np.float64
+    )
+    labels = iter(_confidence_labels(scores).tolist())
     
     # Process each note
     results: list[NoteWithSuggestions] = []
     
-    for note in notes:
-        suggestions = classifier.classify(
-            note,
-            top_k=request.top_k,
-            min_score=request.min_score
-        )
-        
+    for note, suggestions in zip(notes, batch):
         results.append(NoteWithSuggestions(
             note_id=note.id,
             note_name=note.name or "(Sin nombre)",
@@ -181,7 +240,7 @@ async def process_notes(request: ProcessRequest):
                     tag_id=s.tag.id,
                     tag_name=s.tag.name,
                     score=s.score,
-                    confidence=s.confidence_label
+                    confidence=next(labels)
                 )
                 for s in suggestions
             ]
@@ -219,31 +278,37 @@ async def apply_tag(request: ApplyRequest):
 
 
 @app.post("/cache/tags")
-async def update_tags_cache(tags: list[dict]):
+async def update_tags_cache(request: Request):
     """
     Update the tags cache with new data.
     
     Call this endpoint with the output from mcp_tana-local_list_tags.
+    The raw body is written to disk as-is after validation.
     """
-    CACHE_DIR.mkdir(exist_ok=True)
-    with open(TAGS_CACHE, "w", encoding="utf-8") as f:
-        json.dump(tags, f, indent=2, ensure_ascii=False)
+    body = await request.body()
+    try:
+        count = write_raw_json_list(TAGS_CACHE, body)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid tags payload: {e}")
     
-    return {"status": "success", "tags_cached": len(tags)}
+    return {"status": "success", "tags_cached": count}
 
 
 @app.post("/cache/notes")
-async def update_notes_cache(notes: list[dict]):
+async def update_notes_cache(request: Request):
     """
     Update the notes cache with new data.
     
     Call this endpoint with the output from mcp_tana-local_search_nodes.
+    The raw body is written to disk as-is after validation.
     """
-    CACHE_DIR.mkdir(exist_ok=True)
-    with open(NOTES_CACHE, "w", encoding="utf-8") as f:
-        json.dump(notes, f, indent=2, ensure_ascii=False)
+    body = await request.body()
+    try:
+        count = write_raw_json_list(NOTES_CACHE, body)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid notes payload: {e}")
     
-    return {"status": "success", "notes_cached": len(notes)}
+    return {"status": "success", "notes_cached": count}
 
 
 # ==================== TELEGRAM BOT ENDPOINTS ====================
@@ -287,12 +352,18 @@ class TelegramApplyResponse(BaseModel):
 async def telegram_webhook(request: Request):
     """Receive updates from Telegram webhook."""
     from telegram import Update
+    from .telegram_bot import HANDLED_UPDATE_KEYS
     
     if not config.telegram_enabled:
         raise HTTPException(status_code=503, detail="Telegram bot not configured")
     
     try:
-        data = await request.json()
+        data = orjson.loads(await request.body())
+        
+        # Skip update types the bot has no handlers for (edits, chat member, ...)
+        if data.keys().isdisjoint(HANDLED_UPDATE_KEYS):
+            return {"status": "ignored"}
+        
         update = Update.de_json(data, None)
         
         # Process update through bot application
@@ -366,21 +437,20 @@ async def _process_telegram_sync(session_id: str, days_back: int):
             await _notify_user(session, "📭 No se encontraron notas sin etiquetar.")
             return
         
-        session.notes = notes
+        session.set_notes(notes)
         session.set_state(SessionState.CLASSIFYING)
         
-        # Step 3: Classify
-        classifier = get_classifier()
-        classifier.load_tags(tags)
-        
-        for note in notes:
-            suggestions = classifier.classify(note, top_k=3, min_score=0.25)
-            session.suggestions[note.id] = suggestions
+        # Step 3: Classify (in the worker thread so the loop keeps serving)
+        batch = await asyncio.get_running_loop().run_in_executor(
+            CLASSIFIER_POOL, _classify_notes, tags, notes, 3, 0.25
+        )
+        for note, suggestions in zip(notes, batch):
+            session.set_suggestions(note.id, suggestions)
         
         session.set_state(SessionState.REVIEWING)
         
         # Step 4: Notify user
-        suggestions_count = sum(1 for s in session.suggestions.values() if s)
+        suggestions_count = len(session.top_suggestions)
         message = (
             f"✅ *Listo!*\n\n"
             f"📋 {len(notes)} notas encontradas\n"
@@ -410,9 +480,9 @@ async def get_telegram_suggestions(session_id: str):
         raise HTTPException(status_code=404, detail="Session not found or expired")
     
     suggestions_list = []
+    top_suggestions = session.top_suggestions
     for note in session.notes:
-        note_suggestions = session.suggestions.get(note.id, [])
-        top = note_suggestions[0] if note_suggestions else None
+        top = top_suggestions.get(note.id)
         
         suggestions_list.append({
             "note_id": note.id,
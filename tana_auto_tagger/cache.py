@@ -0,0 +1,98 @@
+"""Fast JSON read/write helpers for the local cache files."""
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+# path -> (mtime_ns, entry count) for status polling
+_COUNT_CACHE: dict[Path, tuple[int, int]] = {}
+
+
+def read_json(path: Path) -> Any:
+    """
+    Read and parse a JSON cache file.
+
+    Parsed results are memoized by modification time, so repeated reads of
+    an unchanged file skip both disk I/O and parsing. Callers must treat the
+    returned object as read-only.
+    """
+    return _read_json_cached(path, path.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=4)
+def _read_json_cached(path: Path, mtime_ns: int) -> Any:
+    """Parse a JSON file; keyed on mtime so rewrites invalidate the entry."""
+    return orjson.loads(path.read_bytes())
+
+
+def count_json(path: Path) -> int:
+    """
+    Return the number of entries in a JSON list file.
+
+    Uses, in order: the in-memory count for the current mtime, the
+    ``<name>.count`` sidecar written by write_json (if it is not older than
+    the file), and finally a full parse.
+    """
+    mtime_ns = path.stat().st_mtime_ns
+    cached = _COUNT_CACHE.get(path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+
+    count = _read_count_sidecar(path, mtime_ns)
+    if count is None:
+        count = len(orjson.loads(path.read_bytes()))
+    _COUNT_CACHE[path] = (mtime_ns, count)
+    return count
+
+
+def _count_path(path: Path) -> Path:
+    """Sidecar file holding the entry count of a JSON list file."""
+    return path.with_suffix(".count")
+
+
+def _read_count_sidecar(path: Path, mtime_ns: int) -> int | None:
+    """Read the count sidecar, ignoring it if missing, stale or invalid."""
+    count_path = _count_path(path)
+    try:
+        if count_path.stat().st_mtime_ns < mtime_ns:
+            return None
+        return int(count_path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(path: Path, data: Any, indent: bool = True) -> None:
+    """
+    Write data as UTF-8 JSON, creating the parent directory.
+
+    Output is indented for human-edited files; pass indent=False for
+    compact machine-only caches. For lists, the entry count is also
+    written to a sidecar file so status checks can skip parsing.
+    """
+    path.parent.mkdir(exist_ok=True)
+    option = orjson.OPT_INDENT_2 if indent else None
+    path.write_bytes(orjson.dumps(data, option=option))
+    if isinstance(data, list):
+        _count_path(path).write_text(str(len(data)))
+
+
+def write_raw_json_list(path: Path, body: bytes) -> int:
+    """
+    Validate a raw JSON array payload and write it to disk unchanged.
+
+    Skips the decode/re-encode round trip of write_json for uploads that
+    are already serialized. Returns the number of entries.
+
+    Raises:
+        ValueError: If the payload is not a JSON array
+    """
+    data = orjson.loads(body)
+    if not isinstance(data, list):
+        raise ValueError("Expected a JSON array")
+
+    path.parent.mkdir(exist_ok=True)
+    path.write_bytes(body)
+    _count_path(path).write_text(str(len(data)))
+    return len(data)
@@ -1,10 +1,17 @@
 """AI-powered tag classification using sentence transformers."""
 
+import hashlib
+from pathlib import Path
+
 import numpy as np
 from sentence_transformers import SentenceTransformer
 
 from .config import config
 from .models import Note, Tag, TagSuggestion
+from .onnx_embedder import ORTEmbedder
+
+# Cache path for persisted tag embeddings
+CACHE_DIR = Path(__file__).parent.parent / ".cache"
 
 
 class LocalClassifier:
@@ -18,24 +25,34 @@ class LocalClassifier:
     4. Returns top-K most similar tags as suggestions
     """
     
-    def __init__(self, model_name: str | None = None):
+    def __init__(self, model_name: str | None = None, use_onnx: bool | None = None):
         """
         Initialize the classifier with a sentence transformer model.
         
         Args:
             model_name: HuggingFace model name. Defaults to config value.
+            use_onnx: Run INT8-quantized ONNX inference. Defaults to config value.
         """
         self.model_name = model_name or config.embedding_model
-        self._model: SentenceTransformer | None = None
+        self.use_onnx = config.use_onnx if use_onnx is None else use_onnx
+        self.embedding_dim_trunc = config.embedding_dim_trunc
+        self._model: SentenceTransformer | ORTEmbedder | None = None
         self._tag_embeddings: np.ndarray | None = None
+        self._tag_embeddings_norm: np.ndarray | None = None
         self._tags: list[Tag] = []
+        self._tag_objects: np.ndarray = np.empty(0, dtype=object)
+        self._tag_texts: list[str] = []
+        self._last_sig: tuple | None = None
     
     @property
-    def model(self) -> SentenceTransformer:
+    def model(self) -> SentenceTransformer | ORTEmbedder:
         """Lazy-load the model on first use."""
         if self._model is None:
             print(f"Loading model: {self.model_name}...")
-            self._model = SentenceTransformer(self.model_name)
+            if self.use_onnx:
+                self._model = ORTEmbedder(self.model_name)
+            else:
+                self._model = SentenceTransformer(self.model_name)
             print("Model loaded!")
         return self._model
     
@@ -46,8 +63,17 @@ class LocalClassifier:
         Args:
             tags: List of tags to embed
         """
+        # Skip re-encoding when the same tag set is loaded again
+        sig = (self.model_name, tuple((t.id, t.name, t.description) for t in tags))
+        if sig == self._last_sig and self._tag_embeddings is not None:
+            return
+        
         self._tags = tags
         
+        # Object array parallel to the embedding rows for vectorized gathers
+        self._tag_objects = np.empty(len(tags), dtype=object)
+        self._tag_objects[:] = tags
+        
         # Create rich descriptions for better matching
         tag_texts = []
         for tag in tags:
@@ -57,16 +83,76 @@ class LocalClassifier:
                 text = f"{tag.name}: {tag.description}"
             tag_texts.append(text)
         
-        # Generate embeddings
-        self._tag_embeddings = self.model.encode(
-            tag_texts,
-            convert_to_numpy=True,
-            show_progress_bar=len(tags) > 20
+        # Reuse persisted embeddings when the model and tag set are unchanged
+        tag_ids = [tag.id for tag in tags]
+        model_key = f"{self.model_name}+onnx-int8" if self.use_onnx else self.model_name
+        key = hashlib.blake2b(
+            (model_key + "\n" + "\n".join(tag_texts)).encode("utf-8")
+        ).hexdigest()[:16]
+        cache_file = CACHE_DIR / f"tag_emb_{key}.npz"
+        
+        embeddings = self._load_cached_embeddings(cache_file, tag_ids)
+        if embeddings is None:
+            embeddings = self._encode_tag_texts(tag_texts)
+            self._save_cached_embeddings(cache_file, tag_ids, embeddings)
+        self._tag_embeddings = embeddings.astype(np.float16, copy=False)
+        self._tag_texts = tag_texts
+        
+        # Normalize once so every similarity is a single dot product.
+        # The GEMM operand stays float32: numpy has no BLAS float16 matmul.
+        self._tag_embeddings_norm = np.ascontiguousarray(
+            self._truncate_normalize(self._tag_embeddings.astype(np.float32)),
+            dtype=np.float32
         )
+        self._last_sig = sig
+    
+    def _encode_tag_texts(self, tag_texts: list[str]) -> np.ndarray:
+        """
+        Generate tag embeddings, reusing rows from the previous load.
+        
+        Only texts that were not embedded last time are tokenized and
+        encoded, so adding or renaming a few tags does not re-run the
+        model over the whole vocabulary.
+        """
+        previous: dict[str, np.ndarray] = {}
+        if self._tag_embeddings is not None:
+            previous = dict(zip(self._tag_texts, self._tag_embeddings))
         
-        # Store embeddings in tag objects for reference
-        for i, tag in enumerate(self._tags):
-            tag.embedding = self._tag_embeddings[i].tolist()
+        missing = [text for text in dict.fromkeys(tag_texts) if text not in previous]
+        if missing:
+            new_embeddings = self.model.encode(
+                missing,
+                convert_to_numpy=True,
+                show_progress_bar=len(missing) > 20
+            )
+            # Raw vectors are only kept for reference, so store them as float16
+            previous.update(zip(missing, new_embeddings.astype(np.float16)))
+        
+        if not tag_texts:
+            return np.zeros((0, 0), dtype=np.float16)
+        return np.stack([previous[text] for text in tag_texts])
+    
+    @staticmethod
+    def _load_cached_embeddings(path: Path, tag_ids: list[str]) -> np.ndarray | None:
+        """Load persisted tag embeddings if they match the given tag IDs."""
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if data["ids"].tolist() != tag_ids:
+                    return None
+                return data["embeddings"]
+        except (OSError, ValueError, KeyError):
+            return None
+    
+    @staticmethod
+    def _save_cached_embeddings(path: Path, tag_ids: list[str], embeddings: np.ndarray) -> None:
+        """Persist tag embeddings with their tag IDs for staleness checks."""
+        try:
+            path.parent.mkdir(exist_ok=True)
+            np.savez(path, embeddings=embeddings, ids=np.array(tag_ids, dtype=str))
+        except OSError as e:
+            print(f"Could not cache tag embeddings: {e}")
     
     def classify(
         self,
@@ -85,51 +171,141 @@ class LocalClassifier:
         Returns:
             List of TagSuggestion objects sorted by score (descending)
         """
+        # A single-row batch shares the GEMM + top-K path of classify_batch
+        return self.classify_batch([note], top_k=top_k, min_score=min_score)[0]
+    
+    def classify_batch(
+        self,
+        notes: list[Note],
+        top_k: int = 3,
+        min_score: float = 0.2
+    ) -> list[list[TagSuggestion]]:
+        """
+        Classify many notes with a single batched encode call.
+        
+        Args:
+            notes: The notes to classify
+            top_k: Maximum number of suggestions per note
+            min_score: Minimum similarity score threshold
+            
+        Returns:
+            One list of TagSuggestion objects per note, in input order
+        """
         if self._tag_embeddings is None or len(self._tags) == 0:
             raise ValueError("Tags not loaded. Call load_tags() first.")
         
-        # Combine note name and content for better matching
-        note_text = note.name
-        if note.content:
-            note_text = f"{note.name}\n{note.content}"
-        
-        # Skip empty notes
-        if not note_text.strip():
+        if not notes:
             return []
         
-        # Generate note embedding
-        note_embedding = self.model.encode(
-            note_text,
-            convert_to_numpy=True
-        )
+        texts = [self._note_text(note) for note in notes]
+        
+        # Encode each distinct non-empty text once; empty notes get no slot
+        unique_texts = [t for t in dict.fromkeys(texts) if t.strip()]
+        if not unique_texts:
+            return [[] for _ in notes]
         
-        # Compute cosine similarities
-        similarities = self._cosine_similarity(note_embedding, self._tag_embeddings)
+        note_embs = self._encode_notes(unique_texts)
         
-        # Get top-K indices
-        top_indices = np.argsort(similarities)[::-1][:top_k]
+        sims = note_embs @ self._tag_embeddings_norm.T
         
-        # Build suggestions
-        suggestions = []
-        for idx in top_indices:
-            score = float(similarities[idx])
-            if score >= min_score:
-                suggestions.append(TagSuggestion(
-                    tag=self._tags[idx],
-                    score=score
-                ))
+        top_indices, top_scores, keep = _topk_filter(sims, top_k, min_score)
         
-        return suggestions
+        # Gather tags for all rows at once
+        top_tags = self._tag_objects[top_indices]
+        
+        per_text: dict[str, list[TagSuggestion]] = {}
+        for text, row_tags, row_scores, row_keep in zip(
+            unique_texts, top_tags, top_scores.tolist(), keep
+        ):
+            per_text[text] = [
+                TagSuggestion(tag=tag, score=score)
+                for tag, score, ok in zip(row_tags, row_scores, row_keep)
+                if ok
+            ]
+        
+        # Scatter back to input order; each note gets its own list
+        return [list(per_text.get(text, ())) for text in texts]
+    
+    def _encode_notes(self, texts: list[str]) -> np.ndarray:
+        """
+        Encode note texts in one batched call, sorted by length.
+        
+        Sorting by approximate token count keeps similarly sized texts in
+        the same batch, so each batch pads only to its own longest entry.
+        Rows are returned in the original order.
+        """
+        lengths = np.fromiter((len(t.split()) for t in texts), dtype=np.int64, count=len(texts))
+        order = np.argsort(lengths, kind="stable")
+        
+        embs = self.model.encode(
+            [texts[i] for i in order],
+            batch_size=64,
+            convert_to_numpy=True,
+            normalize_embeddings=self.embedding_dim_trunc is None,
+            show_progress_bar=len(texts) > 64
+        )
+        
+        if self.embedding_dim_trunc is not None:
+            embs = self._truncate_normalize(embs)
+        
+        # Inverse-permute back to input order
+        result = np.empty_like(embs)
+        result[order] = embs
+        return result
+    
+    def _truncate_normalize(self, embs: np.ndarray) -> np.ndarray:
+        """
+        L2-normalize embeddings, truncating them first if configured.
+        
+        Matryoshka-trained models keep most of their quality in the leading
+        dimensions, so slicing before normalization shrinks the similarity
+        matmul without retraining.
+        """
+        if self.embedding_dim_trunc is not None:
+            embs = embs[..., :self.embedding_dim_trunc]
+        return embs / np.linalg.norm(embs, axis=-1, keepdims=True)
     
     @staticmethod
-    def _cosine_similarity(a: np.ndarray, b: np.ndarray) -> np.ndarray:
-        """Compute cosine similarity between vector a and matrix b."""
-        # Normalize vectors
-        a_norm = a / np.linalg.norm(a)
-        b_norm = b / np.linalg.norm(b, axis=1, keepdims=True)
-        
-        # Dot product gives cosine similarity for normalized vectors
-        return np.dot(b_norm, a_norm)
+    def _note_text(note: Note) -> str:
+        """Combine note name and content for better matching."""
+        if note.content:
+            return f"{note.name}\n{note.content}"
+        return note.name
+
+
+def _topk_filter(
+    sims: np.ndarray,
+    top_k: int,
+    min_score: float
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Select the top-K columns of each similarity row and apply the threshold.
+    
+    Args:
+        sims: (N, T) similarity matrix
+        top_k: Number of columns to keep per row
+        min_score: Minimum score for a column to be kept
+        
+    Returns:
+        (indices, scores, keep) arrays of shape (N, K), sorted by descending
+        score per row; keep marks entries with score >= min_score
+    """
+    n, t = sims.shape
+    k = max(0, min(top_k, t))
+    if k == 0:
+        empty = np.empty((n, 0), dtype=np.intp)
+        return empty, np.empty((n, 0), dtype=sims.dtype), np.empty((n, 0), dtype=bool)
+    
+    # Partial top-K per row, then sort only those K columns
+    if k < t:
+        cand = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+    else:
+        cand = np.broadcast_to(np.arange(k), (n, k))
+    cand_scores = np.take_along_axis(sims, cand, axis=1)
+    order = np.argsort(-cand_scores, axis=1)
+    indices = np.take_along_axis(cand, order, axis=1)
+    scores = np.take_along_axis(cand_scores, order, axis=1)
+    return indices, scores, scores >= min_score
 
 
 # Singleton instance for reuse
@@ -10,6 +10,7 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.table import Table
 from rich.panel import Panel
 
+from .cache import count_json, read_json, write_json
 from .config import config
 from .models import Note, Tag, TagSuggestion
 from .classifier import get_classifier, LocalClassifier
@@ -49,6 +50,9 @@ CACHE_DIR = Path(__file__).parent.parent / ".cache"
 TAGS_CACHE = CACHE_DIR / "tags.json"
 NOTES_CACHE = CACHE_DIR / "notes.json"
 
+# Shared data provider (stateless, safe to reuse across calls)
+_PROVIDER = TanaDataProvider()
+
 
 def load_cached_tags() -> list[Tag]:
     """Load tags from cache file."""
@@ -56,12 +60,10 @@ def load_cached_tags() -> list[Tag]:
         console.print("[red]No hay tags en caché. Usa --refresh-tags primero.[/red]")
         raise typer.Exit(1)
     
-    with open(TAGS_CACHE, "r", encoding="utf-8") as f:
-        raw_tags = json.load(f)
+    raw_tags = read_json(TAGS_CACHE)
     
-    provider = TanaDataProvider()
-    tags = provider.parse_tags_response(raw_tags)
-    return provider.filter_excluded_tags(tags)
+    tags = _PROVIDER.parse_tags_response(raw_tags)
+    return _PROVIDER.filter_excluded_tags(tags)
 
 
 def load_cached_notes() -> list[Note]:
@@ -70,24 +72,19 @@ def load_cached_notes() -> list[Note]:
         console.print("[red]No hay notas en caché. Usa --refresh-notes primero.[/red]")
         raise typer.Exit(1)
     
-    with open(NOTES_CACHE, "r", encoding="utf-8") as f:
-        raw_notes = json.load(f)
+    raw_notes = read_json(NOTES_CACHE)
     
-    return TanaDataProvider.parse_notes_response(raw_notes)
+    return _PROVIDER.parse_notes_response(raw_notes)
 
 
 def save_tags_cache(tags: list[dict]) -> None:
     """Save raw tags to cache."""
-    CACHE_DIR.mkdir(exist_ok=True)
-    with open(TAGS_CACHE, "w", encoding="utf-8") as f:
-        json.dump(tags, f, indent=2, ensure_ascii=False)
+    write_json(TAGS_CACHE, tags)
 
 
 def save_notes_cache(notes: list[dict]) -> None:
     """Save raw notes to cache."""
-    CACHE_DIR.mkdir(exist_ok=True)
-    with open(NOTES_CACHE, "w", encoding="utf-8") as f:
-        json.dump(notes, f, indent=2, ensure_ascii=False)
+    write_json(NOTES_CACHE, notes)
 
 
 @app.command()
@@ -123,8 +120,7 @@ def process(
         all_notes = load_cached_notes()
         
         # Filter to parent notes only
-        provider = TanaDataProvider()
-        notes = provider.filter_parent_notes_only(all_notes)
+        notes = _PROVIDER.filter_parent_notes_only(all_notes)
         
         progress.add_task("Inicializando clasificador AI...", total=None)
         classifier = get_classifier()
@@ -144,10 +140,9 @@ def process(
     with Progress(console=console) as progress:
         task = progress.add_task("Clasificando notas...", total=len(notes))
         
-        for note in notes:
-            suggestions = classifier.classify(note, top_k=top_k, min_score=min_score)
-            results.append((note, suggestions))
-            progress.advance(task)
+        batch = classifier.classify_batch(notes, top_k=top_k, min_score=min_score)
+        results.extend(zip(notes, batch))
+        progress.advance(task, len(notes))
     
     # Show results or start review
     if dry_run:
@@ -201,7 +196,6 @@ def _interactive_review(
     
     # Export assignments for later use
     if assignments:
-        CACHE_DIR.mkdir(exist_ok=True)
         assignments_file = CACHE_DIR / "pending_assignments.json"
         
         data = [
@@ -209,8 +203,7 @@ def _interactive_review(
             for n, t in assignments
         ]
         
-        with open(assignments_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        write_json(assignments_file, data)
         
         console.print(f"\n[green]Asignaciones guardadas en:[/green] {assignments_file}")
         console.print("[dim]Usa 'apply' para aplicar las asignaciones a Tana.[/dim]")
@@ -244,8 +237,7 @@ def refresh_notes(
     
     Las notas deben obtenerse via Antigravity MCP.
     """
-    provider = TanaDataProvider()
-    query = provider.get_search_query(days)
+    query = _PROVIDER.get_search_query(days)
     
     console.print(Panel(
         "[bold]Actualizar Caché de Notas[/bold]\n\n"
@@ -273,8 +265,7 @@ def apply():
         console.print("[red]No hay asignaciones pendientes.[/red]")
         raise typer.Exit(1)
     
-    with open(assignments_file, "r", encoding="utf-8") as f:
-        assignments = json.load(f)
+    assignments = read_json(assignments_file)
     
     console.print(Panel(
         "[bold]Aplicar Asignaciones[/bold]\n\n"
@@ -316,23 +307,20 @@ def status():
     console.print(f"  Directorio: {CACHE_DIR}")
     
     if TAGS_CACHE.exists():
-        with open(TAGS_CACHE) as f:
-            tag_count = len(json.load(f))
+        tag_count = count_json(TAGS_CACHE)
         console.print(f"  [green]✓[/green] Tags: {tag_count}")
     else:
         console.print(f"  [red]✗[/red] Tags: No existe")
     
     if NOTES_CACHE.exists():
-        with open(NOTES_CACHE) as f:
-            note_count = len(json.load(f))
+        note_count = count_json(NOTES_CACHE)
         console.print(f"  [green]✓[/green] Notas: {note_count}")
     else:
         console.print(f"  [red]✗[/red] Notas: No existe")
     
     pending = CACHE_DIR / "pending_assignments.json"
     if pending.exists():
-        with open(pending) as f:
-            pending_count = len(json.load(f))
+        pending_count = count_json(pending)
         console.print(f"  [yellow]![/yellow] Pendientes: {pending_count}")
 
 
@@ -1,9 +1,10 @@
 """Configuration management for Tana Auto-Tagger."""
 
 import os
+import sys
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import ClassVar, Optional
 from dotenv import load_dotenv
 
 # Load .env file from project root
@@ -20,7 +21,7 @@ class Config:
     mcp_server_url: str
     tana_local_url: str
     embedding_model: str
-    excluded_tag_ids: set[str]
+    excluded_tag_ids: frozenset[str]
     
     # Telegram Bot configuration
     telegram_bot_token: str
@@ -30,29 +31,65 @@ class Config:
     request_timeout: float = 30.0
     telegram_webhook_url: Optional[str] = None
     telegram_use_webhook: bool = True
+    use_onnx: bool = False
+    embedding_dim_trunc: Optional[int] = None
+    
+    # Parsed forms of telegram_allowed_username (numeric ID or username)
+    allowed_user_id: Optional[int] = field(init=False, default=None)
+    allowed_username_lower: str = field(init=False, default="")
+    
+    # Memoized result of from_env()
+    _cached: ClassVar[Optional["Config"]] = None
+    
+    def __post_init__(self):
+        """Parse the allowed Telegram user once."""
+        allowed = self.telegram_allowed_username
+        if allowed.isdecimal():
+            self.allowed_user_id = int(allowed)
+        else:
+            self.allowed_username_lower = allowed.lower()
     
     @classmethod
-    def from_env(cls) -> "Config":
-        """Load configuration from environment variables."""
-        excluded_ids = os.getenv("EXCLUDED_TAG_IDS", "")
+    def from_env(cls, refresh: bool = False) -> "Config":
+        """
+        Load configuration from environment variables.
+        
+        The result is cached; pass refresh=True to re-read the environment.
+        """
+        if cls._cached is not None and not refresh:
+            return cls._cached
+        
+        env = os.environ
+        excluded_ids = env.get("EXCLUDED_TAG_IDS", "")
         
         # Parse excluded tag IDs
-        excluded_tag_ids = set(id.strip() for id in excluded_ids.split(",") if id.strip())
+        excluded_tag_ids = frozenset(
+            sys.intern(s) for s in (x.strip() for x in excluded_ids.split(",")) if s
+        )
         
         # Parse webhook setting
-        use_webhook = os.getenv("TELEGRAM_USE_WEBHOOK", "true").lower() == "true"
+        use_webhook = env.get("TELEGRAM_USE_WEBHOOK", "true").lower() == "true"
+        
+        # Parse ONNX inference setting
+        use_onnx = env.get("USE_ONNX", "false").lower() == "true"
+        
+        # Parse Matryoshka truncation dimension (0/empty disables it)
+        dim_trunc = int(env.get("EMBEDDING_DIM_TRUNC", "0") or 0) or None
         
-        return cls(
-            workspace_id=os.getenv("TANA_WORKSPACE_ID", "8YR1337hvC"),
-            mcp_server_url=os.getenv("MCP_SERVER_URL", "http://localhost:3000"),
-            tana_local_url=os.getenv("TANA_LOCAL_URL", "http://localhost:1111"),
-            embedding_model=os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2"),
+        cls._cached = cls(
+            workspace_id=env.get("TANA_WORKSPACE_ID", "8YR1337hvC"),
+            mcp_server_url=env.get("MCP_SERVER_URL", "http://localhost:3000"),
+            tana_local_url=env.get("TANA_LOCAL_URL", "http://localhost:1111"),
+            embedding_model=env.get("EMBEDDING_MODEL", "all-MiniLM-L6-v2"),
             excluded_tag_ids=excluded_tag_ids,
-            telegram_bot_token=os.getenv("TELEGRAM_BOT_TOKEN", ""),
-            telegram_allowed_username=os.getenv("TELEGRAM_ALLOWED_USERNAME", ""),
-            telegram_webhook_url=os.getenv("TELEGRAM_WEBHOOK_URL"),
+            telegram_bot_token=env.get("TELEGRAM_BOT_TOKEN", ""),
+            telegram_allowed_username=env.get("TELEGRAM_ALLOWED_USERNAME", ""),
+            telegram_webhook_url=env.get("TELEGRAM_WEBHOOK_URL"),
             telegram_use_webhook=use_webhook,
+            use_onnx=use_onnx,
+            embedding_dim_trunc=dim_trunc,
         )
+        return cls._cached
     
     @property
     def telegram_enabled(self) -> bool:
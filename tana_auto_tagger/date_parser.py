@@ -3,21 +3,87 @@
 import re
 import logging
 from datetime import date, datetime, timedelta
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Sequence
 
-import dateparser
+from dateparser.date import DateDataParser
 
 from .telegram_models import DateParseResult
 
 logger = logging.getLogger(__name__)
 
+# Range expressions, tried in this order by _parse_patterns
+# "últimos X días" / "last X days"
+_LAST_N_DAYS_RE = re.compile(r"(?:últimos?|last)\s+(\d+)\s+(?:días?|days?)")
+# "desde X hasta Y"
+_DESDE_HASTA_RE = re.compile(r"desde\s+(.+?)\s+hasta\s+(.+)")
+# "YYYY-MM-DD YYYY-MM-DD"
+_ISO_RANGE_RE = re.compile(r"(\d{4}-\d{2}-\d{2})\s+(\d{4}-\d{2}-\d{2})")
+
+# Single extended ISO 8601 date, e.g. "2024-02-01" or "2024-2-1"
+_ISO_SINGLE_RE = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+
+# Parsers built once: dateparser.parse() with languages/settings constructs
+# a new DateDataParser (and reloads locale data) on every call
+_DDP = DateDataParser(
+    languages=['es', 'en'],
+    settings={
+        'PREFER_DATES_FROM': 'past',
+        'RETURN_AS_TIMEZONE_AWARE': False,
+    }
+)
+_DDP_STRICT = DateDataParser(
+    languages=['es', 'en'],
+    settings={'RETURN_AS_TIMEZONE_AWARE': False}
+)
+
+_ONE_DAY = timedelta(days=1)
+_ONE_WEEK = timedelta(days=7)
+_SIX_DAYS = timedelta(days=6)
+
+
+def _today_range(today: date) -> tuple[date, date]:
+    """Today only."""
+    return today, today
+
+
+def _yesterday_range(today: date) -> tuple[date, date]:
+    """Yesterday only."""
+    yesterday = today - _ONE_DAY
+    return yesterday, yesterday
+
+
+def _this_week_range(today: date) -> tuple[date, date]:
+    """From Monday to today."""
+    return today - timedelta(days=today.weekday()), today
+
+
+def _last_week_range(today: date) -> tuple[date, date]:
+    """Previous week (Monday to Sunday)."""
+    last_monday = today - timedelta(days=today.weekday()) - _ONE_WEEK
+    return last_monday, last_monday + _SIX_DAYS
+
+
+# Keyword -> function producing (start, end) from today's date
+_SPECIAL_CASES = {
+    "hoy": _today_range,
+    "today": _today_range,
+    "ayer": _yesterday_range,
+    "yesterday": _yesterday_range,
+    "esta semana": _this_week_range,
+    "this week": _this_week_range,
+    "semana pasada": _last_week_range,
+    "last week": _last_week_range,
+}
+
 
 class DateParser:
     """Parse natural language date expressions in Spanish."""
     
-    def __init__(self):
-        """Initialize date parser with Spanish settings."""
-        self.today = date.today()
+    @property
+    def today(self) -> date:
+        """Current date, read per call so long-running processes roll over."""
+        return date.today()
     
     def parse(self, text: str) -> DateParseResult:
         """
@@ -33,89 +99,83 @@ class DateParser:
         """
         text_lower = text.lower().strip()
         
+        dates = _parse_cached(text_lower, self.today)
+        if dates:
+            start_date, end_date = dates
+            return DateParseResult(
+                success=True,
+                start_date=start_date,
+                end_date=end_date
+            )
+        
+        return DateParseResult(
+            success=False,
+            error_message=f"No pude entender '{text}'. Prueba con: hoy, ayer, últimos 3 días, 2024-02-01 2024-02-05"
+        )
+    
+    @staticmethod
+    def _parse_uncached(text_lower: str, today: date) -> Optional[DateParseResult]:
+        """Run every parsing strategy on normalized text relative to today."""
+        # Fast path for a single ISO date, avoiding the dateparser fallback
+        iso_match = _ISO_SINGLE_RE.fullmatch(text_lower)
+        if iso_match:
+            try:
+                single = date(*map(int, iso_match.groups()))
+                return DateParseResult(
+                    success=True,
+                    start_date=single,
+                    end_date=single
+                )
+            except ValueError:
+                pass
+        
         # Handle special cases first
-        result = self._parse_special_cases(text_lower)
+        result = DateParser._parse_special_cases(text_lower, today)
         if result:
             return result
         
         # Try regex patterns for ranges
-        result = self._parse_patterns(text_lower)
+        result = DateParser._parse_patterns(text_lower, today)
         if result:
             return result
         
         # Try dateparser for natural language
-        result = self._parse_with_dateparser(text_lower)
-        if result:
-            return result
-        
-        return DateParseResult(
-            success=False,
-            error_message=f"No pude entender '{text}'. Prueba con: hoy, ayer, últimos 3 días, 2024-02-01 2024-02-05"
-        )
+        return DateParser._parse_with_dateparser(text_lower)
     
-    def _parse_special_cases(self, text: str) -> Optional[DateParseResult]:
+    @staticmethod
+    def _parse_special_cases(text: str, today: date) -> Optional[DateParseResult]:
         """Parse special keywords like 'hoy', 'ayer'."""
+        resolve = _SPECIAL_CASES.get(text)
+        if resolve is None:
+            return None
         
-        if text in ["hoy", "today"]:
-            return DateParseResult(
-                success=True,
-                start_date=self.today,
-                end_date=self.today
-            )
-        
-        if text in ["ayer", "yesterday"]:
-            yesterday = self.today - timedelta(days=1)
-            return DateParseResult(
-                success=True,
-                start_date=yesterday,
-                end_date=yesterday
-            )
-        
-        if text in ["esta semana", "this week"]:
-            # From Monday to today
-            monday = self.today - timedelta(days=self.today.weekday())
-            return DateParseResult(
-                success=True,
-                start_date=monday,
-                end_date=self.today
-            )
-        
-        if text in ["semana pasada", "last week"]:
-            # Previous week (Monday to Sunday)
-            last_monday = self.today - timedelta(days=self.today.weekday() + 7)
-            last_sunday = last_monday + timedelta(days=6)
-            return DateParseResult(
-                success=True,
-                start_date=last_monday,
-                end_date=last_sunday
-            )
-        
-        return None
+        start_date, end_date = resolve(today)
+        return DateParseResult(
+            success=True,
+            start_date=start_date,
+            end_date=end_date
+        )
     
-    def _parse_patterns(self, text: str) -> Optional[DateParseResult]:
+    @staticmethod
+    def _parse_patterns(text: str, today: date) -> Optional[DateParseResult]:
         """Parse regex patterns for common expressions."""
         
         # "últimos X días" / "last X days"
-        pattern = r"(?:últimos?|last)\s+(\d+)\s+(?:días?|days?)"
-        match = re.search(pattern, text)
+        match = _LAST_N_DAYS_RE.search(text)
         if match:
             days = int(match.group(1))
-            start_date = self.today - timedelta(days=days-1)
+            start_date = today - timedelta(days=days-1)
             return DateParseResult(
                 success=True,
                 start_date=start_date,
-                end_date=self.today
+                end_date=today
             )
         
         # "desde X hasta Y"
-        pattern = r"desde\s+(.+?)\s+hasta\s+(.+)"
-        match = re.search(pattern, text)
+        match = _DESDE_HASTA_RE.search(text)
         if match:
-            start_text = match.group(1)
-            end_text = match.group(2)
-            
-            start_date = self._parse_single_date(start_text)
-            end_date = self._parse_single_date(end_text)
+            start_date = DateParser._parse_single_date(match.group(1))
+            end_date = DateParser._parse_single_date(match.group(2))
             
             if start_date and end_date:
                 return DateParseResult(
@@ -125,8 +185,7 @@ class DateParser:
                 )
         
         # ISO format: "2024-02-01 2024-02-05"
-        pattern = r"(\d{4}-\d{2}-\d{2})\s+(\d{4}-\d{2}-\d{2})"
-        match = re.search(pattern, text)
+        match = _ISO_RANGE_RE.search(text)
         if match:
             try:
                 start_date = date.fromisoformat(match.group(1))
@@ -141,18 +200,12 @@ class DateParser:
         
         return None
     
-    def _parse_with_dateparser(self, text: str) -> Optional[DateParseResult]:
+    @staticmethod
+    def _parse_with_dateparser(text: str) -> Optional[DateParseResult]:
         """Use dateparser library for complex natural language."""
         
         # Try to parse as a single date
-        parsed = dateparser.parse(
-            text,
-            languages=['es', 'en'],
-            settings={
-                'PREFER_DATES_FROM': 'past',
-                'RETURN_AS_TIMEZONE_AWARE': False,
-            }
-        )
+        parsed = _DDP.get_date_data(text).date_obj
         
         if parsed:
             parsed_date = parsed.date()
@@ -164,7 +217,8 @@ class DateParser:
         
         return None
     
-    def _parse_single_date(self, text: str) -> Optional[date]:
+    @staticmethod
+    def _parse_single_date(text: str) -> Optional[date]:
         """Parse a single date string."""
         text = text.strip()
         
@@ -175,11 +229,7 @@ class DateParser:
             pass
         
         # Try dateparser
-        parsed = dateparser.parse(
-            text,
-            languages=['es', 'en'],
-            settings={'RETURN_AS_TIMEZONE_AWARE': False}
-        )
+        parsed = _DDP_STRICT.get_date_data(text).date_obj
         
         if parsed:
             return parsed.date()
@@ -187,10 +237,32 @@ class DateParser:
         return None
 
 
+@lru_cache(maxsize=512)
+def _parse_cached(text_lower: str, today: date) -> Optional[tuple[date, date]]:
+    """
+    Memoized parse keyed on normalized text and the current day.
+    
+    Relative results ("hoy", "ayer") are computed from the today argument,
+    so they expire at day rollover. Returns (start, end) or None if
+    unparseable.
+    """
+    result = DateParser._parse_uncached(text_lower, today)
+    if result is None:
+        return None
+    return result.start_date, result.end_date
+
+
 # Global parser instance
 date_parser = DateParser()
 
 
-def parse_date_range(text: str) -> DateParseResult:
-    """Convenience function to parse a date range."""
+def parse_date_range(text: str | Sequence[str]) -> DateParseResult:
+    """
+    Convenience function to parse a date range.
+    
+    Accepts the raw text or its whitespace-split tokens (e.g. command
+    arguments); a single token such as "hoy" is used without joining.
+    """
+    if not isinstance(text, str):
+        text = text[0] if len(text) == 1 else " ".join(text)
     return date_parser.parse(text)
@@ -1,23 +1,31 @@
 """Data models for Tana entities."""
 
+from bisect import bisect_right
 from dataclasses import dataclass, field
 from datetime import datetime
 
+# Score thresholds for confidence labels
+HIGH_CONFIDENCE = 0.7
+MEDIUM_CONFIDENCE = 0.4
 
-@dataclass
+# Sorted thresholds and the label for each bucket between them
+_THRESHOLDS = (MEDIUM_CONFIDENCE, HIGH_CONFIDENCE)
+_LABELS = ("Low", "Medium", "High")
+
+
+@dataclass(slots=True)
 class Tag:
     """Represents a Tana super tag."""
     
     id: str
     name: str
     description: str = ""
-    embedding: list[float] = field(default_factory=list)
     
     def __hash__(self):
         return hash(self.id)
 
 
-@dataclass
+@dataclass(slots=True)
 class Note:
     """Represents a Tana note/node."""
     
@@ -34,7 +42,7 @@ class Note:
         return " > ".join(self.breadcrumb) if self.breadcrumb else ""
 
 
-@dataclass
+@dataclass(slots=True)
 class TagSuggestion:
     """A suggested tag with confidence score."""
     
@@ -44,8 +52,5 @@ class TagSuggestion:
     @property
     def confidence_label(self) -> str:
         """Human-readable confidence level."""
-        if self.score >= 0.7:
-            return "High"
-        elif self.score >= 0.4:
-            return "Medium"
-        return "Low"
+        # bisect_right so a score equal to a threshold falls in the upper bucket
+        return _LABELS[bisect_right(_THRESHOLDS, self.score)]
@@ -0,0 +1,178 @@
+"""INT8-quantized ONNX Runtime embedder for CPU inference."""
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+# Cache path for exported/quantized models
+CACHE_DIR = Path(__file__).parent.parent / ".cache"
+
+# Organization SentenceTransformer assumes for bare names like "all-MiniLM-L6-v2"
+_ST_ORG = "sentence-transformers/"
+
+# sentence-transformers file holding the model's max_seq_length
+_ST_CONFIG = "sentence_bert_config.json"
+
+
+def _resolve_model_name(model_name: str) -> str:
+    """Expand a bare model name to its HuggingFace id, as SentenceTransformer does."""
+    if "/" in model_name or Path(model_name).exists():
+        return model_name
+    return _ST_ORG + model_name
+
+
+class ORTEmbedder:
+    """
+    Drop-in replacement for SentenceTransformer.encode backed by ONNX Runtime.
+
+    On first use the HuggingFace model is exported to ONNX and dynamically
+    quantized to INT8 (AVX-512 VNNI config), then reused from disk.
+    Embeddings use mean pooling over the last hidden state, matching the
+    sentence-transformers MiniLM/MPNet family.
+
+    Requires the optional ``onnx`` extra: ``pip install -e .[onnx]``.
+    """
+
+    def __init__(self, model_name: str):
+        """
+        Load (exporting and quantizing if needed) the ONNX model.
+
+        Args:
+            model_name: HuggingFace model name
+        """
+        try:
+            import onnxruntime as ort
+            from transformers import AutoTokenizer
+        except ImportError as e:
+            raise ImportError(
+                "ONNX inference requires optional dependencies. "
+                "Install with: pip install -e .[onnx]"
+            ) from e
+
+        self.model_name = model_name
+        repo_id = _resolve_model_name(model_name)
+        model_dir = CACHE_DIR / "onnx" / repo_id.replace("/", "__")
+        model_path = model_dir / "model_quantized.onnx"
+
+        if not model_path.exists():
+            self._export_quantized(repo_id, model_dir)
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+
+        # Truncate like SentenceTransformer (e.g. 256), not at the tokenizer's 512
+        self.max_seq_length = (
+            self._load_max_seq_length(model_dir)
+            or self._load_max_seq_length(repo_id)
+            or self.tokenizer.model_max_length
+        )
+
+        sess_options = ort.SessionOptions()
+        sess_options.intra_op_num_threads = os.cpu_count() or 1
+        self.session = ort.InferenceSession(
+            str(model_path),
+            sess_options,
+            providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+    @staticmethod
+    def _export_quantized(model_name: str, model_dir: Path) -> None:
+        """Export the model to ONNX and write an INT8 dynamic-quantized copy."""
+        from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from transformers import AutoTokenizer
+
+        print(f"Exporting {model_name} to ONNX...")
+        model_dir.mkdir(parents=True, exist_ok=True)
+
+        model = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True)
+        model.save_pretrained(model_dir)
+        AutoTokenizer.from_pretrained(model_name).save_pretrained(model_dir)
+
+        max_seq_length = ORTEmbedder._load_max_seq_length(model_name)
+        if max_seq_length:
+            (model_dir / _ST_CONFIG).write_text(
+                json.dumps({"max_seq_length": max_seq_length})
+            )
+
+        quantizer = ORTQuantizer.from_pretrained(model_dir)
+        qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+        quantizer.quantize(save_dir=model_dir, quantization_config=qconfig)
+        print("ONNX model quantized!")
+
+    @staticmethod
+    def _load_max_seq_length(model: str | Path) -> int | None:
+        """
+        Read max_seq_length from a local dir or HuggingFace repo.
+
+        Returns:
+            The sequence length, or None if the model does not define one
+        """
+        config_path = Path(model) / _ST_CONFIG
+        if not config_path.exists():
+            if isinstance(model, Path):
+                return None
+            from huggingface_hub import hf_hub_download
+            try:
+                config_path = Path(hf_hub_download(model, _ST_CONFIG))
+            except Exception:
+                # Missing file, unknown repo or offline; error types vary by version
+                return None
+
+        try:
+            return int(json.loads(config_path.read_text())["max_seq_length"])
+        except (OSError, KeyError, TypeError, ValueError):
+            return None
+
+    def encode(
+        self,
+        sentences: str | list[str],
+        batch_size: int = 32,
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = False,
+        show_progress_bar: bool = False,
+    ) -> np.ndarray:
+        """
+        Encode one or many texts into embeddings.
+
+        Mirrors the subset of SentenceTransformer.encode used by the classifier.
+
+        Returns:
+            A (D,) array for a single string, otherwise an (N, D) float32 array
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+
+        chunks = []
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            tokens = self.tokenizer(
+                batch,
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np"
+            )
+            feeds = {
+                name: value.astype(np.int64)
+                for name, value in tokens.items()
+                if name in self._input_names
+            }
+            hidden = self.session.run(None, feeds)[0]
+
+            # Mean pooling over non-padding tokens
+            mask = tokens["attention_mask"][..., None].astype(np.float32)
+            summed = (hidden * mask).sum(axis=1)
+            chunks.append(summed / np.clip(mask.sum(axis=1), 1e-9, None))
+
+        if chunks:
+            embs = np.concatenate(chunks).astype(np.float32, copy=False)
+        else:
+            embs = np.zeros((0, 0), dtype=np.float32)
+
+        if normalize_embeddings and len(embs):
+            embs /= np.clip(np.linalg.norm(embs, axis=1, keepdims=True), 1e-12, None)
+
+        return embs[0] if single else embs
@@ -11,6 +11,9 @@ from .models import Note, Tag, TagSuggestion
 
 console = Console()
 
+# Rich color for each confidence label
+_CONFIDENCE_COLOR = {"High": "green", "Medium": "yellow", "Low": "red"}
+
 
 class ReviewSession:
     """
@@ -29,6 +32,22 @@ class ReviewSession:
         """
         self.all_tags = sorted(all_tags, key=lambda t: t.name.lower())
         self.decisions: list[tuple[Note, Tag | None]] = []
+        
+        # Manual selection list, rendered once and reused for every note
+        self._tag_rows = self._render_tag_rows(self.all_tags)
+        self._tag_by_index = {i: t for i, t in enumerate(self.all_tags, 1)}
+    
+    @staticmethod
+    def _render_tag_rows(tags: list[Tag], cols: int = 3) -> list[str]:
+        """Format numbered tags into rich-markup rows of `cols` columns."""
+        rows = []
+        for i in range(0, len(tags), cols):
+            row_tags = tags[i:i+cols]
+            rows.append("  ".join(
+                f"[cyan]{i+j+1:3}[/cyan] {t.name[:20]:<20}"
+                for j, t in enumerate(row_tags)
+            ))
+        return rows
     
     def review_note(
         self,
@@ -65,16 +84,13 @@ class ReviewSession:
             table.add_column("Score", justify="right")
             
             for i, suggestion in enumerate(suggestions, 1):
-                confidence_color = {
-                    "High": "green",
-                    "Medium": "yellow",
-                    "Low": "red"
-                }.get(suggestion.confidence_label, "white")
+                label = suggestion.confidence_label
+                confidence_color = _CONFIDENCE_COLOR.get(label, "white")
                 
                 table.add_row(
                     str(i),
                     suggestion.tag.name,
-                    f"[{confidence_color}]{suggestion.confidence_label}[/]",
+                    f"[{confidence_color}]{label}[/]",
                     f"{suggestion.score:.1%}"
                 )
             
@@ -90,14 +106,15 @@ class ReviewSession:
         console.print("  [cyan]q[/cyan]   = Salir de la revisión")
         
         choice = Prompt.ask("\nTu elección", default="s")
+        choice_l = choice.lower()
         
-        if choice.lower() == "q":
+        if choice_l == "q":
             raise KeyboardInterrupt("Usuario canceló la revisión")
         
-        if choice.lower() == "s":
+        if choice_l == "s":
             return None
         
-        if choice.lower() == "m":
+        if choice_l == "m":
             return self._manual_tag_selection()
         
         # Try to parse as number
@@ -118,13 +135,7 @@ class ReviewSession:
         console.print("\n[bold]Tags disponibles:[/bold]")
         
         # Display in columns
-        cols = 3
-        for i in range(0, len(self.all_tags), cols):
-            row_tags = self.all_tags[i:i+cols]
-            row_str = "  ".join(
-                f"[cyan]{i+j+1:3}[/cyan] {t.name[:20]:<20}"
-                for j, t in enumerate(row_tags)
-            )
+        for row_str in self._tag_rows:
             console.print(row_str)
         
         choice = Prompt.ask("\nNúmero del tag (o Enter para cancelar)")
@@ -133,9 +144,9 @@ class ReviewSession:
             return None
         
         try:
-            idx = int(choice) - 1
-            if 0 <= idx < len(self.all_tags):
-                return self.all_tags[idx]
+            tag = self._tag_by_index.get(int(choice))
+            if tag is not None:
+                return tag
         except ValueError:
             pass
         
@@ -1,8 +1,9 @@
 """In-memory session manager for Telegram bot."""
 
+import heapq
 import logging
-from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+import time
+from typing import Dict, List, Optional, Set, Tuple
 
 from .telegram_models import TelegramSession, SessionState
 
@@ -16,6 +17,8 @@ class SessionManager:
         """Initialize empty session store."""
         self._sessions: Dict[str, TelegramSession] = {}
         self._user_sessions: Dict[int, str] = {}  # user_id -> session_id
+        self._user_to_sessions: Dict[int, Set[str]] = {}  # user_id -> all session_ids
+        self._expiry_heap: List[Tuple[float, str]] = []  # (expires_monotonic, session_id)
         logger.info("SessionManager initialized")
     
     def create_session(self, user_id: int, username: str) -> TelegramSession:
@@ -30,6 +33,8 @@ class SessionManager:
         
         self._sessions[session.session_id] = session
         self._user_sessions[user_id] = session.session_id
+        self._user_to_sessions.setdefault(user_id, set()).add(session.session_id)
+        heapq.heappush(self._expiry_heap, (session.expires_monotonic, session.session_id))
         
         logger.info(f"Created session {session.session_id} for user {username} ({user_id})")
         return session
@@ -55,21 +60,22 @@ class SessionManager:
         session = self._sessions.get(session_id)
         if session:
             del self._sessions[session_id]
-            # Remove from user index
+            # Remove from user indexes
             if self._user_sessions.get(session.user_id) == session_id:
                 del self._user_sessions[session.user_id]
+            user_sids = self._user_to_sessions.get(session.user_id)
+            if user_sids is not None:
+                user_sids.discard(session_id)
+                if not user_sids:
+                    del self._user_to_sessions[session.user_id]
             logger.info(f"Deleted session {session_id}")
             return True
         return False
     
     def cleanup_user_sessions(self, user_id: int):
         """Remove all sessions for a user."""
-        # Find all sessions for this user
-        to_delete = [
-            sid for sid, session in self._sessions.items()
-            if session.user_id == user_id
-        ]
-        for sid in to_delete:
+        # Look up this user's sessions through the reverse index
+        for sid in list(self._user_to_sessions.get(user_id, ())):
             self.delete_session(sid)
         
         if user_id in self._user_sessions:
@@ -77,16 +83,27 @@ class SessionManager:
     
     def cleanup_expired(self) -> int:
         """Remove all expired sessions. Returns count removed."""
-        expired = [
-            sid for sid, session in self._sessions.items()
-            if session.is_expired()
-        ]
-        for sid in expired:
-            self.delete_session(sid)
+        # Only pop heap entries that are due. Entries may be stale: the
+        # session was already deleted, or touch() pushed its expiry later.
+        # "Due" is strict to match is_expired(), so an entry exactly at its
+        # deadline is left in place rather than popped and re-pushed.
+        now = time.monotonic()
+        removed = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] < now:
+            _, sid = heapq.heappop(heap)
+            session = self._sessions.get(sid)
+            if session is None:
+                continue
+            if session.is_expired():
+                self.delete_session(sid)
+                removed += 1
+            else:
+                heapq.heappush(heap, (session.expires_monotonic, sid))
         
-        if expired:
-            logger.info(f"Cleaned up {len(expired)} expired sessions")
-        return len(expired)
+        if removed:
+            logger.info(f"Cleaned up {removed} expired sessions")
+        return removed
     
     def get_all_sessions(self) -> List[TelegramSession]:
         """Get all active sessions."""
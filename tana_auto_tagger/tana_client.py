@@ -1,13 +1,48 @@
 """HTTP client for Tana MCP Server communication."""
 
+import html
 import json
+import re
 import subprocess
+import sys
 from datetime import datetime
 from typing import Any
 
 from .config import config
 from .models import Note, Tag
 
+# Calendar day node title, e.g. "2024-02-04 - Sunday"
+_DAY_NODE_RE = re.compile(r'^\d{4}-\d{2}-\d{2} - \w+$')
+
+# datetime.fromisoformat accepts a trailing "Z" from Python 3.11 onwards
+_FROMISO_HANDLES_Z = sys.version_info >= (3, 11)
+
+# Underline markup wrapped around breadcrumb titles
+_U_TAG_RE = re.compile(r'</?u>')
+
+# Structural headers to ignore (treat notes inside these as parents)
+IGNORED_HEADERS = frozenset({
+    "Daily Preparation",
+    "Action: Plan for Today",
+    "Inbox",
+    "Agenda",
+    "Tasks",
+    "Notes",
+})
+
+
+def _unesc(s: str) -> str:
+    """Unescape HTML entities (&amp;, &lt;, ...) only if the string has any."""
+    return html.unescape(s) if "&" in s else s
+
+
+def _is_day_node(title: str) -> bool:
+    """Check for a "YYYY-MM-DD - Weekday" title, rejecting most titles without regex."""
+    # Cheap structural check first; the regex confirms digits and weekday
+    if len(title) < 14 or title[10:13] != " - " or title[4] != "-" or title[7] != "-":
+        return False
+    return _DAY_NODE_RE.match(title) is not None
+
 
 class TanaClient:
     """Client to interact with Tana via MCP server tools."""
@@ -98,7 +133,7 @@ class TanaDataProvider:
         return [
             Tag(
                 id=t.get("id", ""),
-                name=t.get("name", "").replace("&amp;", "&"),
+                name=_unesc(t.get("name", "")),
             )
             for t in raw_tags
         ]
@@ -107,17 +142,22 @@ class TanaDataProvider:
     def parse_notes_response(raw_notes: list[dict]) -> list[Note]:
         """Parse raw note data from MCP search response."""
         notes = []
+        fromiso = datetime.fromisoformat
+        handles_z = _FROMISO_HANDLES_Z
         for n in raw_notes:
             created = None
-            if n.get("created"):
+            raw_created = n.get("created")
+            if raw_created:
                 try:
-                    created = datetime.fromisoformat(n["created"].replace("Z", "+00:00"))
-                except (ValueError, TypeError):
+                    if not handles_z:
+                        raw_created = raw_created.replace("Z", "+00:00")
+                    created = fromiso(raw_created)
+                except (ValueError, TypeError, AttributeError):
                     pass
             
             notes.append(Note(
                 id=n.get("id", ""),
-                name=n.get("name", "").replace("&amp;", "&"),
+                name=_unesc(n.get("name", "")),
                 breadcrumb=n.get("breadcrumb", []),
                 created=created,
             ))
@@ -125,7 +165,8 @@ class TanaDataProvider:
     
     def filter_excluded_tags(self, tags: list[Tag]) -> list[Tag]:
         """Remove system/excluded tags from the list."""
-        return [t for t in tags if t.id not in self.excluded_tag_ids]
+        excluded = self.excluded_tag_ids
+        return [t for t in tags if t.id not in excluded]
     
     @staticmethod
     def is_parent_note(note: Note) -> bool:
@@ -140,38 +181,28 @@ class TanaDataProvider:
         if not note.breadcrumb:
             return False
         
-        # Structural headers to ignore (treat notes inside these as parents)
-        IGNORED_HEADERS = {
-            "Daily Preparation",
-            "Action: Plan for Today",
-            "Inbox",
-            "Agenda",
-            "Tasks",
-            "Notes"
-        }
-        
-        import re
-        day_pattern = r'^\d{4}-\d{2}-\d{2} - \w+$'
+        ignored = IGNORED_HEADERS
         
         # Check if any of the recent parents is a day node, skipping structural headers
         # We look from the bottom up (end of breadcrumb)
         for parent in reversed(note.breadcrumb):
             # If we hit a day node, this is a valid parent note
-            if re.match(day_pattern, parent):
+            if _is_day_node(parent):
                 return True
                 
             # If we hit a normal parent note (not in our ignore list), 
             # then our note is a child of that note -> return False
             # Clean parent name of HTML/formatting if needed (basic check)
-            clean_parent = parent.replace("<u>", "").replace("</u>", "").strip()
-            if clean_parent not in IGNORED_HEADERS:
+            clean_parent = _U_TAG_RE.sub("", parent).strip() if "<" in parent else parent.strip()
+            if clean_parent not in ignored:
                 return False
                 
         return False
     
     def filter_parent_notes_only(self, notes: list[Note]) -> list[Note]:
         """Filter to keep only parent notes (exclude children)."""
-        return [n for n in notes if self.is_parent_note(n)]
+        is_parent = self.is_parent_note
+        return [n for n in notes if is_parent(n)]
 
     
     def get_search_query(self, days_back: int = 7) -> dict:
@@ -1,8 +1,10 @@
 """Telegram Bot handlers and logic for Tana Auto-Tagger."""
 
 from __future__ import annotations
+import asyncio
 import logging
-from typing import Optional, TYPE_CHECKING
+from functools import lru_cache
+from typing import Callable, Optional, TYPE_CHECKING
 
 # Standard imports - these work at runtime
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
@@ -12,6 +14,8 @@ from telegram.ext import (
     CallbackQueryHandler,
     ContextTypes,
     ConversationHandler,
+    MessageHandler,
+    filters,
 )
 
 from .config import config
@@ -25,24 +29,42 @@ logger = logging.getLogger(__name__)
 SYNC_INPUT = 1
 REVIEWING = 2
 
+# Emoji shown for each session state in /status
+_STATE_EMOJI = {
+    SessionState.IDLE: "⏸️",
+    SessionState.SYNCING: "🔄",
+    SessionState.CLASSIFYING: "🤖",
+    SessionState.REVIEWING: "👀",
+    SessionState.APPLYING: "✅",
+}
 
-def is_authorized(user) -> bool:
-    """Check if user is in the whitelist by username or user ID."""
-    if not config.telegram_enabled:
-        return False
-    
-    allowed = config.telegram_allowed_username
+
+def _build_auth_predicate(cfg) -> Callable[[object], bool]:
+    """
+    Build the whitelist check for the configured user once.
     
-    # Check if allowed is a user ID (numeric)
-    if allowed.isdigit():
-        return str(user.id) == allowed
+    Args:
+        cfg: Config with the parsed allowed user ID or lowercased username
+        
+    Returns:
+        Predicate taking a Telegram user and returning whether it is allowed
+    """
+    # Check by user ID (numeric)
+    allowed_id = cfg.allowed_user_id
+    if allowed_id is not None:
+        return lambda user: user.id == allowed_id
     
     # Check by username (case insensitive)
-    username = user.username
-    if not username:
-        return False
-    
-    return username.lower() == allowed.lower()
+    allowed_lower = cfg.allowed_username_lower
+    return lambda user: (user.username or "").lower() == allowed_lower
+
+
+_auth_pred = _build_auth_predicate(config)
+
+
+def is_authorized(user) -> bool:
+    """Check if user is in the whitelist by username or user ID."""
+    return config.telegram_enabled and _auth_pred(user)
 
 
 async def start_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -101,8 +123,7 @@ async def sync_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
         return
     
-    date_text = " ".join(args)
-    date_result = parse_date_range(date_text)
+    date_result = parse_date_range(args)
     
     if not date_result.success:
         await update.message.reply_text(
@@ -120,7 +141,7 @@ async def sync_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     message = await update.message.reply_text(
         f"⏳ *Procesando...*\n\n"
         f"📅 Rango: {date_str}\n"
-        f"🆔 Sesión: `{session.session_id[:8]}...`\n\n"
+        f"🆔 Sesión: `{session.session_id}`\n\n"
         "Te aviso cuando termine.",
         parse_mode="Markdown"
     )
@@ -130,6 +151,7 @@ async def sync_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     # Store session in context for background processing
     context.user_data["session_id"] = session.session_id
+    context.user_data["current_page"] = 0
     
     logger.info(f"Started sync for user {user.username}, session {session.session_id}")
     
@@ -155,14 +177,9 @@ async def status_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     # Format session info
-    state_emoji = {
-        SessionState.IDLE: "⏸️",
-        SessionState.SYNCING: "🔄",
-        SessionState.CLASSIFYING: "🤖",
-        SessionState.REVIEWING: "👀",
-        SessionState.APPLYING: "✅",
-    }.get(session.state, "❓")
+    state_emoji = _STATE_EMOJI.get(session.state, "❓")
     
+    session.sync_timestamps()
     date_range_str = "No definido"
     if session.date_range:
         start, end = session.date_range
@@ -173,9 +190,9 @@ async def status_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         f"{state_emoji} Estado: {session.state.value}\n"
         f"📅 Rango: {date_range_str}\n"
         f"📝 Notas: {len(session.notes)}\n"
-        f"☑️ Aprobadas: {len(session.approved)}\n"
-        f"🕐 Creada: {session.created_at.strftime('%H:%M:%S')}\n"
-        f"⏳ Expira: {session.expires_at.strftime('%H:%M:%S') if session.expires_at else 'N/A'}"
+        f"☑️ Aprobadas: {session.get_approved_count()}\n"
+        f"🕐 Creada: {session.created_str}\n"
+        f"⏳ Expira: {session.expires_str or 'N/A'}"
     )
     
     await update.message.reply_text(text, parse_mode="Markdown")
@@ -212,31 +229,79 @@ async def unknown_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     )
 
 
+# Window in which rapid checkbox toggles are coalesced into one edit
+_TOGGLE_DEBOUNCE_SECONDS = 0.2
+
+
 def create_suggestions_keyboard(session, page: int = 0, per_page: int = 5):
-    """Create inline keyboard for reviewing suggestions."""
-    from .models import TagSuggestion
+    """
+    Create inline keyboard for reviewing suggestions.
+    
+    Keyboards are cached on the session by page (and cleared when approvals
+    change), so navigating back and forth without toggling reuses the built
+    markup.
+    """
+    return session.cached_keyboard(
+        page,
+        per_page,
+        lambda: _build_suggestions_keyboard(session, page, per_page)
+    )
+
+
+def _note_label(note, top_suggestion) -> str:
+    """Button text for a note without its checkbox glyph."""
+    note_text = note.name[:30] + "..." if len(note.name) > 30 else note.name
     
+    if top_suggestion:
+        tag_name = top_suggestion.tag.name
+        score = int(top_suggestion.score * 100)
+        return f"{note_text} → #{tag_name} ({score}%)"
+    return f"{note_text} → ?"
+
+
+# Buttons are immutable, so fixed ones are built once and shared
+_CANCEL_BTN = InlineKeyboardButton("❌ Cancelar", callback_data="cancel")
+
+
+@lru_cache(maxsize=128)
+def _page_btn(text: str, page: int) -> InlineKeyboardButton:
+    """Navigation button to another page."""
+    return InlineKeyboardButton(text, callback_data=f"page:{page}")
+
+
+@lru_cache(maxsize=128)
+def _page_indicator_btn(page: int, total_pages: int) -> InlineKeyboardButton:
+    """Non-clickable "page N/M" indicator."""
+    return InlineKeyboardButton(f"📄 {page+1}/{total_pages}", callback_data="noop")
+
+
+@lru_cache(maxsize=128)
+def _apply_btn(approved_count: int) -> InlineKeyboardButton:
+    """Apply button showing how many notes are selected."""
+    return InlineKeyboardButton(
+        f"✅ Aplicar {approved_count} seleccionados",
+        callback_data="apply"
+    )
+
+
+def _build_suggestions_keyboard(session, page: int, per_page: int):
+    """Build the suggestions keyboard for one page."""
     buttons = []
     
-    # Get suggestions for this page
-    notes = session.notes[page * per_page:(page + 1) * per_page]
+    # Get suggestions for this page as parallel lists
+    notes, top_suggestions = session.page_view(page, per_page)
+    approved = session.approved
+    approved_flags = [note.id in approved for note in notes]
     
-    for note in notes:
-        note_suggestions = session.suggestions.get(note.id, [])
-        top_suggestion = note_suggestions[0] if note_suggestions else None
-        
-        # Checkbox button
-        is_approved = session.is_approved(note.id)
+    for note, top_suggestion, is_approved in zip(notes, top_suggestions, approved_flags):
+        # Checkbox button; only the glyph changes between toggles
         checkbox = "☑️" if is_approved else "☐"
         
-        note_text = note.name[:30] + "..." if len(note.name) > 30 else note.name
-        
-        if top_suggestion:
-            tag_name = top_suggestion.tag.name
-            score = int(top_suggestion.score * 100)
-            btn_text = f"{checkbox} {note_text} → #{tag_name} ({score}%)"
-        else:
-            btn_text = f"{checkbox} {note_text} → ?"
+        label = session.cached_label(
+            note.id,
+            lambda: _note_label(note, top_suggestion)
+        )
+        btn_text = f"{checkbox} {label}"
         
         buttons.append([InlineKeyboardButton(
             btn_text,
@@ -245,28 +310,22 @@ def create_suggestions_keyboard(session, page: int = 0, per_page: int = 5):
     
     # Navigation buttons
     nav_buttons = []
-    total_pages = (len(session.notes) + per_page - 1) // per_page
+    total_pages = len(session.note_pages(per_page))
     
     if page > 0:
-        nav_buttons.append(InlineKeyboardButton("◀️ Anterior", callback_data=f"page:{page-1}"))
+        nav_buttons.append(_page_btn("◀️ Anterior", page - 1))
     
-    nav_buttons.append(InlineKeyboardButton(f"📄 {page+1}/{total_pages}", callback_data="noop"))
+    nav_buttons.append(_page_indicator_btn(page, total_pages))
     
     if page < total_pages - 1:
-        nav_buttons.append(InlineKeyboardButton("Siguiente ▶️", callback_data=f"page:{page+1}"))
+        nav_buttons.append(_page_btn("Siguiente ▶️", page + 1))
     
     if nav_buttons:
         buttons.append(nav_buttons)
     
     # Action buttons
     approved_count = session.get_approved_count()
-    buttons.append([
-        InlineKeyboardButton(
-            f"✅ Aplicar {approved_count} seleccionados",
-            callback_data="apply"
-        ),
-        InlineKeyboardButton("❌ Cancelar", callback_data="cancel")
-    ])
+    buttons.append([_apply_btn(approved_count), _CANCEL_BTN])
     
     return InlineKeyboardMarkup(buttons)
 
@@ -275,18 +334,37 @@ async def callback_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle inline keyboard callbacks."""
     query = update.callback_query
     user = update.effective_user
+    user_data = context.user_data
     
-    if not is_authorized(user):
-        await query.answer("⛔ No autorizado")
-        return
-    
-    await query.answer()  # Acknowledge the callback
+    # Authorization is remembered per user for the rest of the review
+    if not user_data.get("authorized"):
+        if not is_authorized(user):
+            await query.answer("⛔ No autorizado")
+            return
+        user_data["authorized"] = True
     
     data = query.data
-    session = session_manager.get_user_session(user.id)
+    
+    # The apply button answers with its own alert text
+    if data == "apply":
+        session = session_manager.get_user_session(user.id)
+        if session:
+            await _handle_apply(update, context, session)
+        else:
+            await asyncio.gather(query.answer(), _edit_expired(query))
+        return
+    
+    # Acknowledge the callback right away, concurrently with the work below
+    await asyncio.gather(query.answer(), _dispatch_callback(update, context, data))
+
+
+async def _dispatch_callback(update: Update, context: ContextTypes.DEFAULT_TYPE, data: str):
+    """Run the action for a (non-apply) callback."""
+    query = update.callback_query
+    session = session_manager.get_user_session(update.effective_user.id)
     
     if not session:
-        await query.edit_message_text("⌛ Sesión expirada. Usa /sync para empezar de nuevo.")
+        await _edit_expired(query)
         return
     
     if data == "noop":
@@ -297,10 +375,6 @@ async def callback_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await query.edit_message_text("❌ Operación cancelada.")
         return
     
-    if data == "apply":
-        await _handle_apply(update, context, session)
-        return
-    
     if data.startswith("toggle:"):
         note_id = data.split(":", 1)[1]
         await _handle_toggle(update, context, session, note_id)
@@ -312,24 +386,49 @@ async def callback_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
 
+async def _edit_expired(query):
+    """Replace the review message with the session-expired notice."""
+    await query.edit_message_text("⌛ Sesión expirada. Usa /sync para empezar de nuevo.")
+
+
 async def _handle_toggle(update: Update, context: ContextTypes.DEFAULT_TYPE, session, note_id: str):
     """Handle toggle checkbox callback."""
     query = update.callback_query
     
-    # Get top suggestion for this note
-    suggestions = session.suggestions.get(note_id, [])
-    
     if session.is_approved(note_id):
         # Unapprove
         session.unapprove_note(note_id)
     else:
         # Approve with top suggestion
-        if suggestions:
-            top_tag = suggestions[0].tag
-            session.approve_suggestion(note_id, top_tag.id)
+        top_suggestion = session.top_suggestions.get(note_id)
+        if top_suggestion:
+            session.approve_suggestion(note_id, top_suggestion.tag.id)
+    
+    # Refresh keyboard once rapid taps settle; later taps reuse the pending edit
+    session.queue_toggle_edit(
+        query,
+        lambda: asyncio.create_task(_flush_toggle_edit(context, session))
+    )
+
+
+async def _flush_toggle_edit(context: ContextTypes.DEFAULT_TYPE, session):
+    """After the debounce window, push a single keyboard edit for all toggles."""
+    await asyncio.sleep(_TOGGLE_DEBOUNCE_SECONDS)
     
-    # Refresh keyboard
-    keyboard = create_suggestions_keyboard(session, page=0)
+    query = session.take_toggle_query()
+    
+    # Cancelled or applied meanwhile: the message no longer has a keyboard
+    if (
+        session.state is SessionState.APPLYING
+        or session_manager.get_session(session.session_id) is not session
+    ):
+        return
+    
+    # Staying on the page the user is viewing
+    keyboard = create_suggestions_keyboard(
+        session,
+        page=context.user_data.get("current_page", 0)
+    )
     
     try:
         await query.edit_message_reply_markup(reply_markup=keyboard)
@@ -341,6 +440,7 @@ async def _handle_page_change(update: Update, context: ContextTypes.DEFAULT_TYPE
     """Handle page navigation."""
     query = update.callback_query
     
+    context.user_data["current_page"] = page
     keyboard = create_suggestions_keyboard(session, page=page)
     
     try:
@@ -353,7 +453,7 @@ async def _handle_apply(update: Update, context: ContextTypes.DEFAULT_TYPE, sess
     """Handle apply button."""
     query = update.callback_query
     
-    approved_count = len(session.approved)
+    approved_count = session.get_approved_count()
     
     if approved_count == 0:
         await query.answer("⚠️ No has seleccionado ninguna nota")
@@ -361,14 +461,48 @@ async def _handle_apply(update: Update, context: ContextTypes.DEFAULT_TYPE, sess
     
     session.set_state(SessionState.APPLYING)
     
-    await query.edit_message_text(
-        f"⏳ Aplicando {approved_count} tags a Tana...\n"
-        "Esto puede tomar unos segundos."
-    )
-    
     # This will be handled by the API
     # Store that we're waiting for apply
     context.user_data["waiting_apply"] = session.session_id
+    
+    await asyncio.gather(
+        query.answer(),
+        query.edit_message_text(
+            f"⏳ Aplicando {approved_count} tags a Tana...\n"
+            "Esto puede tomar unos segundos."
+        )
+    )
+
+
+# Bot commands, registered in this order
+_HANDLERS = (
+    ("start", start_handler),
+    ("help", help_handler),
+    ("sync", sync_handler),
+    ("status", status_handler),
+    ("cancel", cancel_handler),
+)
+
+# Update payload keys the handlers registered below can act on (commands
+# arrive as "message", buttons as "callback_query"). Webhooks drop any other
+# update unparsed, so extend this when registering a new kind of handler.
+HANDLED_UPDATE_KEYS = ("message", "callback_query")
+
+# Any command not listed in _HANDLERS (optionally addressed as /cmd@bot)
+_UNKNOWN_COMMAND = filters.COMMAND & ~filters.Regex(
+    rf"^/({'|'.join(name for name, _ in _HANDLERS)})\b"
+)
+
+
+def register_handlers(application: Application) -> None:
+    """Add the command, callback and unknown-command handlers to an application."""
+    application.add_handlers(
+        [CommandHandler(name, handler) for name, handler in _HANDLERS]
+        + [
+            CallbackQueryHandler(callback_handler),
+            MessageHandler(_UNKNOWN_COMMAND, unknown_handler),
+        ]
+    )
 
 
 def create_bot_application() -> Optional[Application]:
@@ -378,17 +512,7 @@ def create_bot_application() -> Optional[Application]:
         return None
     
     application = Application.builder().token(config.telegram_bot_token).build()
-    
-    # Add handlers
-    application.add_handler(CommandHandler("start", start_handler))
-    application.add_handler(CommandHandler("help", help_handler))
-    application.add_handler(CommandHandler("sync", sync_handler))
-    application.add_handler(CommandHandler("status", status_handler))
-    application.add_handler(CommandHandler("cancel", cancel_handler))
-    application.add_handler(CallbackQueryHandler(callback_handler))
-    
-    # Unknown commands
-    application.add_handler(CommandHandler("", unknown_handler))
+    register_handlers(application)
     
     logger.info("Telegram bot application created successfully")
     return application
@@ -397,6 +521,8 @@ def create_bot_application() -> Optional[Application]:
 # Export handlers for use in API
 __all__ = [
     'create_bot_application',
+    'register_handlers',
+    'HANDLED_UPDATE_KEYS',
     'is_authorized',
     'start_handler',
     'sync_handler',
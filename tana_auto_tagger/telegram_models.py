@@ -1,13 +1,24 @@
 """Models for Telegram Bot integration."""
 
+import time
 from dataclasses import dataclass, field
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 from uuid import uuid4
 
 from .models import Note, TagSuggestion
 
+# Inactivity period after which a session expires
+SESSION_TTL = timedelta(minutes=30)
+_SESSION_TTL_SECONDS = SESSION_TTL.total_seconds()
+
+# Rendered keyboards kept per session (oldest evicted first)
+_KEYBOARD_CACHE_SIZE = 8
+
+# Clock format for session timestamps shown to the user
+_TIME_FORMAT = "%H:%M:%S"
+
 
 class SessionState(Enum):
     """Finite state machine states for user sessions."""
@@ -18,7 +29,7 @@ class SessionState(Enum):
     APPLYING = "applying"
 
 
-@dataclass
+@dataclass(slots=True)
 class TelegramSession:
     """User session data for Telegram bot workflow."""
     
@@ -28,32 +39,68 @@ class TelegramSession:
     date_range: Optional[tuple[Optional[date], Optional[date]]] = None
     notes: List[Note] = field(default_factory=list)
     suggestions: Dict[str, List[TagSuggestion]] = field(default_factory=dict)
+    top_suggestions: Dict[str, TagSuggestion] = field(default_factory=dict)  # note_id -> best
     approved: Dict[str, str] = field(default_factory=dict)  # note_id -> tag_id
     message_id: Optional[int] = None
     
     # Identifiers
-    session_id: str = field(default_factory=lambda: str(uuid4()))
+    session_id: str = field(default_factory=lambda: uuid4().hex[:12])
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     expires_at: Optional[datetime] = None
     
+    # View caches below are private: use the accessor methods, which own invalidation.
+    # Approval changes clear the keyboard cache, so it only holds current keyboards.
+    _approved_count: int = field(default=0, init=False, repr=False)
+    _keyboard_cache: Dict[tuple, object] = field(default_factory=dict, init=False, repr=False)
+    _pages: Dict[int, List[List[Note]]] = field(default_factory=dict, init=False, repr=False)
+    _page_cache: Dict[tuple, tuple] = field(default_factory=dict, init=False, repr=False)
+    _label_cache: Dict[str, str] = field(default_factory=dict, init=False, repr=False)
+    
+    # Debounced keyboard edit after checkbox toggles (task, latest callback query)
+    _toggle_flush: Optional[object] = field(default=None, init=False, repr=False)
+    _toggle_query: Optional[object] = field(default=None, init=False, repr=False)
+    
+    # Monotonic clock readings; updated_at/expires_at are derived lazily
+    expires_monotonic: float = field(default=0.0, init=False, repr=False)
+    _touched_monotonic: float = field(default=0.0, init=False, repr=False)
+    _synced_monotonic: float = field(default=0.0, init=False, repr=False)
+    
+    # created_at/expires_at formatted as HH:MM:SS for /status
+    created_str: str = field(default="", init=False, repr=False)
+    expires_str: str = field(default="", init=False, repr=False)
+    
     def __post_init__(self):
         """Set expiration time (30 minutes from creation)."""
         if self.expires_at is None:
-            from datetime import timedelta
-            self.expires_at = self.created_at + timedelta(minutes=30)
+            self.expires_at = self.created_at + SESSION_TTL
+        self._approved_count = len(self.approved)
+        self.created_str = self.created_at.strftime(_TIME_FORMAT)
+        self.expires_str = self.expires_at.strftime(_TIME_FORMAT)
+        
+        # Anchor the monotonic deadline to the wall-clock expiration
+        now = time.monotonic()
+        self._touched_monotonic = self._synced_monotonic = now
+        self.expires_monotonic = now + (self.expires_at - datetime.now()).total_seconds()
     
     def touch(self):
         """Update last activity timestamp and extend expiration."""
-        self.updated_at = datetime.now()
-        from datetime import timedelta
-        self.expires_at = self.updated_at + timedelta(minutes=30)
+        now = time.monotonic()
+        self._touched_monotonic = now
+        self.expires_monotonic = now + _SESSION_TTL_SECONDS
+    
+    def sync_timestamps(self):
+        """Refresh updated_at/expires_at from the last touch() before reading them."""
+        if self._synced_monotonic != self._touched_monotonic:
+            elapsed = time.monotonic() - self._touched_monotonic
+            self.updated_at = datetime.now() - timedelta(seconds=elapsed)
+            self.expires_at = self.updated_at + SESSION_TTL
+            self.expires_str = self.expires_at.strftime(_TIME_FORMAT)
+            self._synced_monotonic = self._touched_monotonic
     
     def is_expired(self) -> bool:
         """Check if session has expired."""
-        if self.expires_at is None:
-            return False
-        return datetime.now() > self.expires_at
+        return time.monotonic() > self.expires_monotonic
     
     def set_state(self, state: SessionState):
         """Update session state and touch timestamp."""
@@ -62,25 +109,137 @@ class TelegramSession:
     
     def approve_suggestion(self, note_id: str, tag_id: str):
         """Mark a suggestion as approved."""
+        if note_id not in self.approved:
+            self._approved_count += 1
         self.approved[note_id] = tag_id
+        self._invalidate_keyboards()
         self.touch()
     
     def unapprove_note(self, note_id: str):
         """Remove approval for a note."""
         if note_id in self.approved:
             del self.approved[note_id]
+            self._approved_count -= 1
+            self._invalidate_keyboards()
         self.touch()
     
+    def _invalidate_keyboards(self):
+        """Drop keyboards rendered for an older approval state."""
+        self._keyboard_cache.clear()
+    
+    def set_notes(self, notes: List[Note]):
+        """Replace the notes under review."""
+        self.notes = notes
+        self.clear_view_caches()
+    
+    def set_suggestions(self, note_id: str, suggestions: List[TagSuggestion]):
+        """Store a note's ranked suggestions and index its top one."""
+        self.suggestions[note_id] = suggestions
+        if suggestions:
+            self.top_suggestions[note_id] = suggestions[0]
+        else:
+            self.top_suggestions.pop(note_id, None)
+        self.clear_view_caches()
+    
+    def clear_view_caches(self):
+        """
+        Drop every cached view (pages, labels, keyboards).
+        
+        The single invalidation point for notes/suggestions changes; called by
+        set_notes() and set_suggestions(). Approval changes only drop keyboards.
+        """
+        self._keyboard_cache.clear()
+        self._pages.clear()
+        self._page_cache.clear()
+        self._label_cache.clear()
+    
+    def cached_keyboard(self, page: int, per_page: int, build: Callable[[], object]) -> object:
+        """
+        Get the keyboard for a page, building it on a miss.
+        
+        Keyed by (page, per_page); approval changes clear the cache, so every
+        entry reflects the current approvals. At most _KEYBOARD_CACHE_SIZE
+        keyboards are kept (oldest evicted first).
+        """
+        cache = self._keyboard_cache
+        key = (page, per_page)
+        keyboard = cache.get(key)
+        if keyboard is None:
+            keyboard = build()
+            if len(cache) >= _KEYBOARD_CACHE_SIZE:
+                del cache[next(iter(cache))]
+            cache[key] = keyboard
+        return keyboard
+    
+    def note_pages(self, per_page: int) -> List[List[Note]]:
+        """Notes split into pages of per_page, computed once per page size."""
+        pages = self._pages.get(per_page)
+        if pages is None:
+            notes = self.notes
+            pages = self._pages[per_page] = [
+                notes[i:i + per_page] for i in range(0, len(notes), per_page)
+            ]
+        return pages
+    
+    def page_view(
+        self,
+        page: int,
+        per_page: int
+    ) -> tuple[List[Note], List[Optional[TagSuggestion]]]:
+        """
+        Notes of a page and their top suggestion (or None), as parallel lists.
+        
+        Approval flags are not cached here since they change on every toggle.
+        """
+        key = (page, per_page)
+        view = self._page_cache.get(key)
+        if view is None:
+            pages = self.note_pages(per_page)
+            notes = pages[page] if 0 <= page < len(pages) else []
+            top_by_note = self.top_suggestions
+            view = self._page_cache[key] = (
+                notes,
+                [top_by_note.get(note.id) for note in notes]
+            )
+        return view
+    
+    def cached_label(self, note_id: str, render: Callable[[], str]) -> str:
+        """Get a note's button label, rendering it on a miss."""
+        label = self._label_cache.get(note_id)
+        if label is None:
+            label = self._label_cache[note_id] = render()
+        return label
+    
+    def queue_toggle_edit(self, query: object, start_flush: Callable[[], object]):
+        """
+        Record the latest toggle callback; start a flush unless one is pending.
+        
+        Args:
+            query: Callback query whose message will be edited
+            start_flush: Starts the delayed edit (e.g. creates an asyncio task)
+        """
+        self._toggle_query = query
+        if self._toggle_flush is None:
+            self._toggle_flush = start_flush()
+    
+    def take_toggle_query(self) -> Optional[object]:
+        """End the pending flush and return the callback query to edit."""
+        query = self._toggle_query
+        self._toggle_flush = None
+        self._toggle_query = None
+        return query
+    
     def is_approved(self, note_id: str) -> bool:
         """Check if a note has an approved tag."""
         return note_id in self.approved
     
     def get_approved_count(self) -> int:
         """Get number of approved suggestions."""
-        return len(self.approved)
+        return self._approved_count
     
     def to_dict(self) -> dict:
         """Convert session to dictionary (for serialization)."""
+        self.sync_timestamps()
         return {
             "session_id": self.session_id,
             "user_id": self.user_id,
@@ -91,14 +250,14 @@ class TelegramSession:
                 if self.date_range else None
             ),
             "notes_count": len(self.notes),
-            "approved_count": len(self.approved),
+            "approved_count": self._approved_count,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
             "expires_at": self.expires_at.isoformat() if self.expires_at else None,
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class DateParseResult:
     """Result of parsing a natural language date expression."""
     
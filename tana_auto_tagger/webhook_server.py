@@ -18,6 +18,7 @@ logger.info("WEBHOOK SERVER STARTING")
 logger.info("=" * 60)
 
 # Import FastAPI
+import orjson
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
@@ -26,6 +27,7 @@ app = FastAPI(title="Tana Auto-Tagger Bot")
 
 # Global variables
 bot_app = None
+handled_update_keys = ()  # set from telegram_bot at startup
 bot_token = None
 allowed_user = None
 
@@ -33,7 +35,7 @@ allowed_user = None
 @app.on_event("startup")
 async def startup():
     """Initialize bot on startup."""
-    global bot_app, bot_token, allowed_user
+    global bot_app, bot_token, allowed_user, handled_update_keys
     
     logger.info("Loading configuration...")
     
@@ -50,22 +52,17 @@ async def startup():
         return
     
     try:
-        from telegram import Update
-        from telegram.ext import Application, CommandHandler, ContextTypes
+        from telegram.ext import Application
         
         # Import handlers
-        from tana_auto_tagger.telegram_bot import (
-            start_handler, sync_handler, status_handler, cancel_handler
-        )
+        from tana_auto_tagger.telegram_bot import HANDLED_UPDATE_KEYS, register_handlers
         
         logger.info("Creating bot application...")
         bot_app = Application.builder().token(bot_token).build()
         
         # Add handlers
-        bot_app.add_handler(CommandHandler("start", start_handler))
-        bot_app.add_handler(CommandHandler("sync", sync_handler))
-        bot_app.add_handler(CommandHandler("status", status_handler))
-        bot_app.add_handler(CommandHandler("cancel", cancel_handler))
+        register_handlers(bot_app)
+        handled_update_keys = HANDLED_UPDATE_KEYS
         
         logger.info("Initializing bot...")
         await bot_app.initialize()
@@ -109,7 +106,12 @@ async def telegram_webhook(request: Request):
         from telegram import Update
         
         # Parse update
-        data = await request.json()
+        data = orjson.loads(await request.body())
+        
+        # Skip update types the bot has no handlers for (edits, chat member, ...)
+        if data.keys().isdisjoint(handled_update_keys):
+            return {"status": "ignored"}
+        
         update = Update.de_json(data, bot_app.bot)
         
         # Process update
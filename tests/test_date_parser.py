@@ -0,0 +1,56 @@
+"""Tests for natural language date parsing."""
+
+from datetime import date
+
+from tana_auto_tagger.date_parser import DateParser, parse_date_range
+
+
+class FixedDateParser(DateParser):
+    """Parser pinned to a given day."""
+    
+    def __init__(self, today: date):
+        self._today = today
+    
+    @property
+    def today(self) -> date:
+        return self._today
+
+
+def test_iso_range():
+    result = parse_date_range("2024-02-01 2024-02-05")
+    
+    assert result.success
+    assert result.start_date == date(2024, 2, 1)
+    assert result.end_date == date(2024, 2, 5)
+
+
+def test_desde_hasta_iso():
+    result = parse_date_range("desde 2024-01-01 hasta 2024-01-05")
+    
+    assert result.success
+    assert result.start_date == date(2024, 1, 1)
+    assert result.end_date == date(2024, 1, 5)
+
+
+def test_unparseable_desde_falls_through_to_iso_range():
+    result = parse_date_range("desde 2024-02-01 2024-02-05 hasta xyz")
+    
+    assert result.success
+    assert result.start_date == date(2024, 2, 1)
+    assert result.end_date == date(2024, 2, 5)
+
+
+def test_unparseable_text():
+    result = parse_date_range("nonsense xyz")
+    
+    assert not result.success
+    assert "nonsense xyz" in result.error_message
+
+
+def test_relative_dates_follow_today():
+    first = FixedDateParser(date(2024, 3, 10)).parse("ayer")
+    second = FixedDateParser(date(2024, 3, 11)).parse("ayer")
+    
+    assert first.start_date == date(2024, 3, 9)
+    assert second.start_date == date(2024, 3, 10)
+    assert first.start_date != second.start_date
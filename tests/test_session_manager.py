@@ -0,0 +1,37 @@
+"""Tests for session expiry in the session manager."""
+
+import time
+
+import pytest
+
+from tana_auto_tagger.session_manager import SessionManager
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable replacement for time.monotonic."""
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_cleanup_keeps_session_at_its_deadline(clock):
+    manager = SessionManager()
+    session = manager.create_session(user_id=1, username="ana")
+    
+    clock[0] = session.expires_monotonic
+    
+    assert not session.is_expired()
+    assert manager.cleanup_expired() == 0
+    assert manager.get_session(session.session_id) is session
+
+
+def test_cleanup_removes_session_past_its_deadline(clock):
+    manager = SessionManager()
+    session = manager.create_session(user_id=1, username="ana")
+    
+    clock[0] = session.expires_monotonic + 0.001
+    
+    assert session.is_expired()
+    assert manager.cleanup_expired() == 1
+    assert manager.get_session(session.session_id) is None